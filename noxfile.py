@@ -4,6 +4,7 @@
 # * Imports ----------------------------------------------------------------------------
 from __future__ import annotations
 
+import os
 import shlex
 import shutil
 import sys
@@ -32,6 +33,7 @@ from tools.noxtools import (
     check_for_change_manager,
     combine_list_list_str,
     combine_list_str,
+    conda_pkgs_dirs_env,
     get_python_full_path,
     infer_requirement_path,
     open_webpage,
@@ -66,6 +68,13 @@ nox.options.reuse_existing_virtualenvs = True
 nox.options.sessions = ["test"]
 nox.options.default_venv_backend = "uv"
 
+# Shared conda package cache (opt in with NOX_CONDA_PKGS_DIRS).  Set in the
+# process environment, since nox creates conda environments without passing
+# a per command env.
+if os.environ.get("NOX_CONDA_PKGS_DIRS"):
+    (ROOT / ".nox").mkdir(exist_ok=True)
+    os.environ.update(conda_pkgs_dirs_env(ROOT / ".nox"))
+
 # * Options ---------------------------------------------------------------------------
 
 # if True, use uv lock/sync.  If False, use uv pip compile/sync...
@@ -284,7 +293,8 @@ def install_dependencies(
 
     lock = lock if lock is not None else opts.lock
 
-    if isinstance(session.virtualenv, CondaEnv):
+    venv = session.virtualenv
+    if isinstance(venv, CondaEnv):
         environment_file = infer_requirement_path(
             name,
             ext=".yaml",
@@ -294,10 +304,15 @@ def install_dependencies(
         with check_for_change_manager(
             environment_file,
             hash_path=Path(session.create_tmp()) / "env.json",
+            params={
+                "conda_cmd": venv.conda_cmd,
+                "python_version": python_version,
+                "args": args,
+            },
         ) as changed:
             if changed or opts.update:
                 session.run_install(
-                    session.virtualenv.conda_cmd,
+                    venv.conda_cmd,
                     "env",
                     "update",
                     "--yes",
@@ -305,7 +320,7 @@ def install_dependencies(
                     "-f",
                     environment_file,
                     "--prefix",
-                    session.virtualenv.location,
+                    venv.location,
                     *args,
                 )
             else:
@@ -339,7 +354,7 @@ def install_dependencies(
                 else [f"--python={python_version}"]
             ),
             *args,
-            env={"UV_PROJECT_ENVIRONMENT": location or session.virtualenv.location},
+            env={"UV_PROJECT_ENVIRONMENT": location or venv.location},
         )
 
     else:
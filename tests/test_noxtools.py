@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+pytest.importorskip("nox")
+
+from tools import noxtools
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from tools.noxtools import CacheValidation
+
+
+VALIDATIONS: list[CacheValidation] = ["mtime+hash", "mtime", "hash"]
+
+
+@pytest.fixture
+def dep(example_path: Path) -> Path:
+    path = example_path / "requirements.txt"
+    path.write_text("a\n")
+    return path
+
+
+@pytest.fixture
+def hash_path(example_path: Path) -> Path:
+    return example_path / "hash.json"
+
+
+@pytest.fixture
+def hashed(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Names of files hashed."""
+    out: list[str] = []
+    get_file_hashes = noxtools._get_file_hashes
+
+    def _get_file_hashes(paths: Any, *args: Any, **kwargs: Any) -> list[str]:
+        out.extend(Path(p).name for p in paths)
+        return get_file_hashes(paths, *args, **kwargs)
+
+    monkeypatch.setattr(noxtools, "_get_file_hashes", _get_file_hashes)
+    return out
+
+
+def touch(path: Path) -> None:
+    """Bump modification time of `path` without relying on clock resolution."""
+    mtime_ns = path.stat().st_mtime_ns + 1_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def edit(path: Path, text: str) -> None:
+    path.write_text(text)
+    touch(path)
+
+
+def check(*deps: Path, **kwargs: Any) -> bool:
+    with noxtools.check_for_change_manager(*deps, **kwargs) as changed:
+        pass
+    return changed
+
+
+def read_record(hash_path: Path) -> dict[str, Any]:
+    record: dict[str, Any] = json.loads(hash_path.read_text())
+    return record
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+def test_cold_start(dep: Path, hash_path: Path, validation: CacheValidation) -> None:
+    assert check(dep, hash_path=hash_path, validation=validation)
+
+    record = read_record(hash_path)
+    assert record["__hash_version__"] == noxtools.HASH_VERSION
+    assert record["__params__"] is None
+    assert record["requirements.txt"] is not None
+    assert hash_path.with_name("hash.json.stats").is_file()
+
+    assert not check(dep, hash_path=hash_path, validation=validation)
+
+
+def test_target_path(dep: Path, example_path: Path) -> None:
+    target = example_path / "lock.txt"
+    assert check(dep, target_path=target)
+    # Target was not created, so still changed.
+    assert check(dep, target_path=target)
+
+    target.write_text("lock\n")
+    assert not check(dep, target_path=target)
+    assert (example_path / "lock.txt.hash.json").is_file()
+
+
+def test_unchanged_skips_hashing(dep: Path, hash_path: Path, hashed: list[str]) -> None:
+    check(dep, hash_path=hash_path)
+    hashed.clear()
+
+    assert not check(dep, hash_path=hash_path)
+    assert not hashed
+
+
+def test_touch_then_refresh(dep: Path, hash_path: Path, hashed: list[str]) -> None:
+    check(dep, hash_path=hash_path)
+    touch(dep)
+    hashed.clear()
+
+    assert not check(dep, hash_path=hash_path)
+    assert hashed == ["requirements.txt"]
+
+    # Record refreshed, so no more hashing.
+    hashed.clear()
+    assert not check(dep, hash_path=hash_path)
+    assert not hashed
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+def test_edit(dep: Path, hash_path: Path, validation: CacheValidation) -> None:
+    check(dep, hash_path=hash_path, validation=validation)
+    edit(dep, "b\n")
+
+    assert check(dep, hash_path=hash_path, validation=validation)
+    assert not check(dep, hash_path=hash_path, validation=validation)
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+def test_edit_during_body(
+    dep: Path, hash_path: Path, validation: CacheValidation
+) -> None:
+    check(dep, hash_path=hash_path, validation=validation)
+
+    with noxtools.check_for_change_manager(
+        dep, hash_path=hash_path, validation=validation
+    ) as changed:
+        assert not changed
+        edit(dep, "b\n")
+
+    assert check(dep, hash_path=hash_path, validation=validation)
+
+
+def test_edit_with_older_mtime(dep: Path, hash_path: Path) -> None:
+    check(dep, hash_path=hash_path)
+    dep.write_text("b\n")
+    os.utime(dep, ns=(0, 0))
+
+    assert check(dep, hash_path=hash_path)
+
+
+def test_validation_mtime(
+    dep: Path,
+    hash_path: Path,
+    hashed: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("NOX_CACHE_VALIDATION", "mtime")
+    check(dep, hash_path=hash_path)
+    digest = read_record(hash_path)["requirements.txt"]
+
+    touch(dep)
+    hashed.clear()
+    assert check(dep, hash_path=hash_path)
+    assert not hashed
+
+    # Previous digest is kept, never null.
+    assert read_record(hash_path)["requirements.txt"] == digest
+    assert not check(dep, hash_path=hash_path)
+
+
+def test_validation_hash(dep: Path, hash_path: Path, hashed: list[str]) -> None:
+    check(dep, hash_path=hash_path, validation="hash")
+    hashed.clear()
+
+    assert not check(dep, hash_path=hash_path, validation="hash")
+    assert hashed == ["requirements.txt"]
+
+
+def test_validation_unknown(dep: Path, hash_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown cache validation"):
+        check(dep, hash_path=hash_path, validation="other")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+def test_params(dep: Path, hash_path: Path, validation: CacheValidation) -> None:
+    def _check(**kwargs: Any) -> bool:
+        return check(dep, hash_path=hash_path, validation=validation, **kwargs)
+
+    assert _check()
+    # add
+    assert _check(params={"python": "3.12"})
+    assert not _check(params={"python": "3.12"})
+    # change
+    assert _check(params={"python": "3.13"})
+    # drop
+    assert _check()
+    assert not _check()
+
+
+def test_stale_hash_version(dep: Path, hash_path: Path) -> None:
+    check(dep, hash_path=hash_path)
+    record = read_record(hash_path)
+    hash_path.write_text(
+        json.dumps({**record, "__hash_version__": noxtools.HASH_VERSION - 1})
+    )
+
+    assert check(dep, hash_path=hash_path)
+    assert read_record(hash_path) == record
+
+
+def test_replaced_record(dep: Path, hash_path: Path, hashed: list[str]) -> None:
+    check(dep, hash_path=hash_path)
+    # e.g., checkout of a tracked record.  Recorded stats no longer apply.
+    hash_path.write_text(hash_path.read_text())
+    touch(hash_path)
+    hashed.clear()
+
+    assert not check(dep, hash_path=hash_path)
+    assert hashed == ["requirements.txt"]
+
+
+@pytest.mark.parametrize("matches", [True, False])
+def test_legacy_record(dep: Path, hash_path: Path, matches: bool) -> None:
+    digest = hashlib.md5(dep.read_bytes(), usedforsecurity=False).hexdigest()
+    legacy = {"requirements.txt": digest if matches else "0" * 32}
+    hash_path.write_text(json.dumps(legacy))
+
+    assert check(dep, hash_path=hash_path, params={"a": 1}) is not matches
+    assert read_record(hash_path)["__hash_version__"] == noxtools.HASH_VERSION
+    assert not check(dep, hash_path=hash_path, params={"a": 1})
+
+
+def test_write_hashes_atomic(
+    dep: Path, hash_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    check(dep, hash_path=hash_path)
+    before = hash_path.read_text()
+
+    def replace(self: Path, target: Any) -> Path:
+        msg = "interrupted"
+        raise OSError(msg)
+
+    monkeypatch.setattr(Path, "replace", replace)
+    with pytest.raises(OSError, match="interrupted"):
+        noxtools.write_hashes(hash_path, {"requirements.txt": "other"})
+
+    assert hash_path.read_text() == before
+    assert sorted(p.name for p in hash_path.parent.glob("*.json*")) == [
+        "hash.json",
+        "hash.json.stats",
+    ]
+    assert not list(hash_path.parent.glob(".*.tmp"))
@@ -2,22 +2,40 @@
 
 from __future__ import annotations
 
-import locale
+import hashlib
+import json
 import os
+import re
 import shlex
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple, cast
 
 from nox.logger import logger
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
-    from typing import Any
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from typing import Any, Literal
 
     from nox import Session
 
     PathLike = str | Path
+    CacheValidation = Literal["mtime+hash", "mtime", "hash"]
+
+
+# Version of the hashing scheme used by `_get_file_hash`.  Bump this whenever
+# the hash algorithm changes so that previously written hash files are
+# treated as changed instead of compared against incompatible digests.
+HASH_VERSION = 2
+_HASH_VERSION_KEY = "__hash_version__"
+_PARAMS_KEY = "__params__"
+# Key in stats file for the stats of the hash file itself.
+_RECORD_KEY = "__record__"
+# Files at most this size are hashed with a single read.
+_SMALL_FILE_SIZE = 1 << 20
 
 
 # * Top level installation functions ---------------------------------------------------
@@ -73,6 +91,7 @@ def infer_requirement_path_with_fallback(
     return lock, path
 
 
+@lru_cache
 def infer_requirement_path(
     name: str | None,
     ext: str | None = None,
@@ -80,7 +99,12 @@ def infer_requirement_path(
     lock: bool = False,
     check_exists: bool = True,
 ) -> Path:
-    """Get filename for a conda yaml or pip requirements file."""
+    """
+    Get filename for a conda yaml or pip requirements file.
+
+    Results are cached, so the same file is only resolved (and checked for
+    existence) once per nox invocation.
+    """
     if name is None:
         msg = "must supply name"
         raise ValueError(msg)
@@ -96,9 +120,9 @@ def infer_requirement_path(
 
     if lock:
         if filename.endswith(".yaml"):
-            filename = filename.rstrip(".yaml") + "-conda-lock.yml"
+            filename = filename.removesuffix(".yaml") + "-conda-lock.yml"
         elif filename.endswith(".yml"):
-            filename = filename.rstrip(".yml") + "-conda-lock.yml"
+            filename = filename.removesuffix(".yml") + "-conda-lock.yml"
         elif filename.endswith(".txt"):
             pass
         else:
@@ -117,6 +141,57 @@ def infer_requirement_path(
     return path
 
 
+def conda_pkgs_dirs_env(location: str | Path) -> dict[str, str]:
+    """
+    Environment variables setting the conda package cache from ``NOX_CONDA_PKGS_DIRS``.
+
+    Sharing one package cache (e.g., ``~/.cache/nox-pkgs``) between
+    environments on the same filesystem lets conda/mamba hardlink packages
+    into each environment at `location` instead of copying them.  Returns an
+    empty dict if ``NOX_CONDA_PKGS_DIRS`` is not set.
+
+    Nox creates conda environments without a per command ``env``, so these
+    should be set in ``os.environ`` before any environment is created.
+    """
+    pkgs_dirs = os.environ.get("NOX_CONDA_PKGS_DIRS")
+    if not pkgs_dirs:
+        return {}
+
+    pkgs_path = Path(pkgs_dirs).expanduser()
+    pkgs_path.mkdir(parents=True, exist_ok=True)
+    pkgs_dirs = str(pkgs_path)
+    if not _can_hardlink(pkgs_dirs, os.fspath(location)):
+        logger.warning(
+            "Cannot hardlink from package cache %s to environment %s. "
+            "Packages will be copied.",
+            pkgs_dirs,
+            location,
+        )
+    return {
+        "CONDA_PKGS_DIRS": pkgs_dirs,
+        "MAMBA_PKGS_DIRS": pkgs_dirs,
+        "CONDA_ALWAYS_COPY": "false",
+        "MAMBA_ALWAYS_COPY": "false",
+    }
+
+
+@lru_cache
+def _can_hardlink(src_dir: str, dst_dir: str) -> bool:
+    """Whether a file in `src_dir` can be hardlinked into `dst_dir`."""
+    src = Path(src_dir) / f".nox-link-probe-{os.getpid()}"
+    dst = Path(dst_dir) / src.name
+    try:
+        src.touch()
+        os.link(src, dst)
+    except OSError:
+        return False
+    else:
+        return True
+    finally:
+        dst.unlink(missing_ok=True)
+        src.unlink(missing_ok=True)
+
+
 def get_python_full_path(session: Session) -> str:
     """Full path to session python executable."""
     path = session.run_always(
@@ -132,13 +207,19 @@ def get_python_full_path(session: Session) -> str:
 
 
 # * Utilities --------------------------------------------------------------------------
+# Characters which require `shlex.split` (whitespace, quotes, and escapes).
+_NEEDS_SHLEX = re.compile(r"[\s\"'\\]")
+
+
 def combine_list_str(opts: str | Iterable[str]) -> list[str]:
     """Cleanup str/list[str] to list[str]"""
     if not opts:
         return []
 
-    if isinstance(opts, str):
-        opts = [opts]
+    opts = [opts] if isinstance(opts, str) else list(opts)
+    if all(opt and not _NEEDS_SHLEX.search(opt) for opt in opts):
+        # Nothing for shlex to split or unquote.
+        return opts
     return shlex.split(" ".join(opts))
 
 
@@ -176,50 +257,71 @@ def session_run_commands(
 
 
 # * Caching -------------------------------------------------------------------
+class HashCheck(NamedTuple):
+    """Result of :func:`check_hash_path_for_change`."""
+
+    changed: bool
+    hashes: dict[str, Any]
+    hash_path: Path
+    stats: dict[str, Any]
+    refresh: bool = False
+
+
 @contextmanager
 def check_for_change_manager(
     *deps: str | Path,
     hash_path: str | Path | None = None,
     target_path: str | Path | None = None,
     force_write: bool = False,
+    validation: CacheValidation | None = None,
+    params: Mapping[str, Any] | None = None,
 ) -> Iterator[bool]:
     """
     Context manager to look for changes in dependencies.
 
+    See :func:`check_hash_path_for_change` for parameters.
+
     Yields
     ------
     changed: bool
 
-    If exit normally, write hashes to hash_path file
+    If exit normally, write hashes to hash_path file if changed (or if the
+    record should be refreshed).
 
     """
     # pylint: disable=try-except-raise,no-else-raise, too-many-try-statements
     try:
-        changed, hashes, hash_path = check_hash_path_for_change(
+        check = check_hash_path_for_change(
             *deps,
             target_path=target_path,
             hash_path=hash_path,
+            validation=validation,
+            params=params,
         )
 
-        yield changed
+        yield check.changed
 
     except Exception:  # noqa: TRY203
         raise
 
     else:
-        if force_write or changed:
-            logger.info(f"Writing {hash_path}")
+        if force_write or check.changed or check.refresh:
+            logger.info("Writing %s", check.hash_path)
 
             # make sure the parent directory exists:
-            hash_path.parent.mkdir(parents=True, exist_ok=True)
-            write_hashes(hash_path=hash_path, hashes=hashes)
+            check.hash_path.parent.mkdir(parents=True, exist_ok=True)
+            write_hashes(
+                hash_path=check.hash_path, hashes=check.hashes, stats=check.stats
+            )
 
 
 def check_hash_path_for_change(
     *deps: str | Path,
     target_path: str | Path | None = None,
     hash_path: str | Path | None = None,
-) -> tuple[bool, dict[str, str], Path]:
+    validation: CacheValidation | None = None,
+    params: Mapping[str, Any] | None = None,
+) -> HashCheck:
     """
     Checks a json file `hash_path` for hashes of `other_paths`.
 
@@ -235,21 +337,120 @@ def check_hash_path_for_change(
     target_path :
         Target file (i.e., the final file to be created).
         Defaults to hash_path.
-
+    validation : {"mtime+hash", "mtime", "hash"}, optional
+        How to decide if `deps` changed.  ``"mtime+hash"`` skips hashing if
+        the modification time and size of all `deps` match those recorded
+        with the hashes, and otherwise compares hashes.  ``"mtime"``
+        considers any dep with different modification time or size as
+        changed without hashing (its previous hash is kept, and only deps
+        without one are hashed).
+        ``"hash"`` always compares hashes.
+        Defaults to environment variable ``NOX_CACHE_VALIDATION``, or
+        ``"mtime+hash"`` if not set.
+    params : mapping, optional
+        Other (json serializable) inputs to the target (e.g., backend or
+        python version).  A hash of these (or ``None`` if not passed) is stored
+        with the file hashes, and any change to them, including passing or
+        no longer passing `params`, is treated as a change.
 
     Returns
     -------
-    changed : bool
-    hashes : dict[str, str]
-    hash_path : Path
+    HashCheck
+        With fields ``changed``, ``hashes`` (mapping from path relative to
+        ``hash_path.parent`` to hash, along with the hash scheme version and
+        params), ``hash_path``, ``stats`` (modification time and size of
+        each dep, taken before any hashing), and ``refresh``.  ``refresh`` is
+        True if `deps` were unchanged, but had to be hashed because their
+        stats changed.  Rewriting the record restores the stat only check on
+        the next call.
+
+    Notes
+    -----
+    The stats are written by :func:`write_hashes` to a separate untracked
+    file next to `hash_path`, so tracked hash files stay machine independent.
 
     """
-    import json
+    target_path, hash_path = _get_target_and_hash_path(target_path, hash_path)
+    validation = _get_cache_validation(validation)
+    keys = [os.path.relpath(k, hash_path.parent) for k in deps]
+    # Always record params (``None`` if not passed), so that dropping them
+    # counts as a change.
+    extra: dict[str, Any] = {
+        _HASH_VERSION_KEY: HASH_VERSION,
+        _PARAMS_KEY: None if params is None else _get_params_hash(params),
+    }
+
+    # Stat deps once, before the caller does any work.  These are the values
+    # recorded, so edits made in the meantime are caught by the next check.
+    dep_stats = [Path(k).stat() for k in deps]
+    stats: dict[str, Any] = {
+        k: [st.st_mtime_ns, st.st_size] for k, st in zip(keys, dep_stats)
+    }
+
+    previous_hashes = _read_hashes(target_path, hash_path)
+    if previous_hashes is None:
+        hashes = {**extra, **_hash_deps(deps, keys, dep_stats)}
+        return HashCheck(True, hashes, hash_path, stats)
+
+    if _HASH_VERSION_KEY not in previous_hashes:
+        # Record written before hashes were versioned.  If unchanged, rewrite
+        # it so later checks use the current scheme.
+        changed = _legacy_hashes_changed(deps, keys, previous_hashes)
+        hashes = {**extra, **_hash_deps(deps, keys, dep_stats)}
+        return HashCheck(changed, hashes, hash_path, stats, refresh=not changed)
+
+    previous_stats = _read_stats(hash_path)
+    stats = {**previous_stats, **stats}
+    modified = any(previous_stats.get(k) != stats[k] for k in keys)
+    params_changed = any(previous_hashes.get(k) != v for k, v in extra.items())
+
+    if validation == "mtime":
+        # Never store a null digest.  Keep the previous digest of modified
+        # deps, and only hash deps without one.
+        unhashed = [i for i, k in enumerate(keys) if previous_hashes.get(k) is None]
+        hashes = {
+            **previous_hashes,
+            **extra,
+            **_hash_deps(
+                [deps[i] for i in unhashed],
+                [keys[i] for i in unhashed],
+                [dep_stats[i] for i in unhashed],
+            ),
+        }
+        return HashCheck(modified or params_changed, hashes, hash_path, stats)
+
+    if validation == "mtime+hash" and not (modified or params_changed):
+        # Nothing modified since hashes were written.  Skip hashing.
+        return HashCheck(False, previous_hashes, hash_path, stats)
+
+    hashes = {**extra, **_hash_deps(deps, keys, dep_stats)}
+    changed = any(previous_hashes.get(k) != h for k, h in hashes.items())
+    # Only touched, not modified.  Refresh record so next check can skip hashing.
+    refresh = not changed and validation != "hash"
+    return HashCheck(changed, {**previous_hashes, **hashes}, hash_path, stats, refresh)
+
+
+def _get_params_hash(params: Mapping[str, Any]) -> str:
+    return _new_hasher(
+        json.dumps(params, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def _get_cache_validation(validation: str | None = None) -> CacheValidation:
+    if validation is None:
+        validation = os.environ.get("NOX_CACHE_VALIDATION", "mtime+hash")
+    if validation not in {"mtime+hash", "mtime", "hash"}:
+        msg = f"Unknown cache validation {validation!r}"
+        raise ValueError(msg)
+    return cast("CacheValidation", validation)
 
-    msg = "Must specify target_path or hash_path"
 
+def _get_target_and_hash_path(
+    target_path: str | Path | None, hash_path: str | Path | None
+) -> tuple[Path, Path]:
     if target_path is None:
         if hash_path is None:
+            msg = "Must specify target_path or hash_path"
             raise ValueError(msg)
         target_path = hash_path = Path(hash_path)
     else:
@@ -258,46 +459,162 @@ def check_hash_path_for_change(
             hash_path = target_path.parent / (target_path.name + ".hash.json")
         else:
             hash_path = Path(hash_path)
+    return target_path, hash_path
 
-    hashes: dict[str, str] = {
-        os.path.relpath(k, hash_path.parent): _get_file_hash(k) for k in deps
-    }
 
-    if not target_path.is_file():
-        changed = True
+def _hash_deps(
+    deps: Sequence[str | Path],
+    keys: Sequence[str],
+    stats: Sequence[os.stat_result],
+) -> dict[str, str]:
+    return dict(zip(keys, _get_file_hashes(deps, stats)))
 
-    elif hash_path.is_file():
-        with hash_path.open() as f:
-            previous_hashes: dict[str, Any] = json.load(f)
 
-        changed = False
-        for k, h in hashes.items():
-            previous = previous_hashes.get(k)
-            if previous is None or previous != h:
-                changed = True
-                hashes = {**previous_hashes, **hashes}
-                break
+def _read_hashes(target_path: Path, hash_path: Path) -> dict[str, Any] | None:
+    """
+    Previous hashes, or None if missing or from a different hash scheme.
+
+    Unversioned (legacy md5) records are returned as is.
+    """
+    if not (target_path.is_file() and hash_path.is_file()):
+        return None
+
+    hashes: dict[str, Any] = json.loads(hash_path.read_bytes())
+    if hashes.get(_HASH_VERSION_KEY, HASH_VERSION) != HASH_VERSION:
+        # hashes computed with a different algorithm.  Don't use them.
+        return None
+    return hashes
+
+
+def _legacy_hashes_changed(
+    deps: Sequence[str | Path],
+    keys: Sequence[str],
+    previous_hashes: Mapping[str, Any],
+) -> bool:
+    """Compare `deps` to md5 digests in an unversioned record (without params)."""
+    return any(
+        previous_hashes.get(k) != _get_legacy_file_hash(path)
+        for k, path in zip(keys, deps)
+    )
+
+
+def _get_stats_path(hash_path: Path) -> Path:
+    return hash_path.with_name(f"{hash_path.name}.stats")
+
+
+def _read_stats(hash_path: Path) -> dict[str, Any]:
+    """Recorded dep stats, if they were written for the current `hash_path`."""
+    stats_path = _get_stats_path(hash_path)
+    if not stats_path.is_file():
+        return {}
+
+    stats: dict[str, Any] = json.loads(stats_path.read_bytes())
+    st = hash_path.stat()
+    if stats.pop(_RECORD_KEY, None) != [st.st_mtime_ns, st.st_size]:
+        # hash_path replaced (e.g., by git) since stats were written.
+        return {}
+    return stats
+
+
+def write_hashes(
+    hash_path: str | Path,
+    hashes: dict[str, Any],
+    stats: dict[str, Any] | None = None,
+) -> None:
+    """
+    Write hashes to json file.
+
+    Files are written to a temporary file and then renamed, so an interrupted
+    write never leaves a partial `hash_path` behind.  If passed, `stats`
+    (modification time and size of each dep) are written to an untracked
+    ``{hash_path}.stats`` file, along with the stats of `hash_path` itself.
+    """
+    hash_path = Path(hash_path)
+    _write_bytes_atomic(hash_path, _dumps_json(hashes))
+    if stats is not None:
+        st = hash_path.stat()
+        _write_bytes_atomic(
+            _get_stats_path(hash_path),
+            _dumps_json({_RECORD_KEY: [st.st_mtime_ns, st.st_size], **stats}),
+        )
 
-    else:
-        changed = True
 
-    return changed, hashes, hash_path
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _dumps_json(obj: Any) -> bytes:
+    # Keep indented output so tracked hash files stay stable under prettier.
+    return (json.dumps(obj, indent=2) + "\n").encode()
+
 
+def _get_file_hashes(
+    paths: Sequence[str | Path],
+    stats: Sequence[os.stat_result | None] | None = None,
+    min_parallel: int = 4,
+) -> list[str]:
+    """Hash `paths`.  Uses a thread pool if there are at least `min_parallel` paths."""
+    if stats is None:
+        stats = [None] * len(paths)
 
-def write_hashes(hash_path: str | Path, hashes: dict[str, Any]) -> None:
-    """Write hashes to json file."""
-    import json
+    if len(paths) < min_parallel:
+        return [_get_file_hash(path, st=st) for path, st in zip(paths, stats)]
 
-    with Path(hash_path).open("w", encoding=locale.getpreferredencoding(False)) as f:
-        json.dump(hashes, f, indent=2)
-        f.write("\n")
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+        return list(executor.map(_get_file_hash_with_stat, paths, stats))
 
 
-def _get_file_hash(path: str | Path, buff_size: int = 65536) -> str:
-    import hashlib
+def _get_file_hash_with_stat(path: str | Path, st: os.stat_result | None) -> str:
+    return _get_file_hash(path, st=st)
+
+
+def _get_file_hash(
+    path: str | Path,
+    buff_size: int = 65536,
+    st: os.stat_result | None = None,
+) -> str:
+    # Cache on modification time and size so unchanged files are only read once.
+    path = Path(path)
+    if st is None:
+        st = path.stat()
+    return _get_file_hash_cached(
+        str(path.absolute()), st.st_mtime_ns, st.st_size, buff_size
+    )
+
 
-    md5 = hashlib.md5()
+def _get_legacy_file_hash(path: str | Path, buff_size: int = 65536) -> str:
+    md5 = hashlib.md5(usedforsecurity=False)
     with Path(path).open("rb") as f:
         while data := f.read(buff_size):  # pylint: disable=while-used
             md5.update(data)
     return md5.hexdigest()
+
+
+@lru_cache(maxsize=512)
+def _get_file_hash_cached(
+    path: str,
+    mtime_ns: int,  # noqa: ARG001
+    size: int,
+    buff_size: int,
+) -> str:
+    if size <= _SMALL_FILE_SIZE:
+        # Small files (most requirement files) are hashed from a single read.
+        return _new_hasher(Path(path).read_bytes()).hexdigest()
+
+    with Path(path).open("rb") as f:
+        if sys.version_info >= (3, 11):
+            return hashlib.file_digest(f, _new_hasher).hexdigest()
+
+        hasher = _new_hasher()
+        while data := f.read(buff_size):  # pylint: disable=while-used
+            hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _new_hasher(data: bytes = b"") -> Any:
+    return hashlib.blake2b(data, digest_size=16)